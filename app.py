@@ -4,12 +4,13 @@
 データはGoogleスプレッドシートに保存されます
 """
 
+import time
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta, timezone
-import plotly.express as px
 import plotly.graph_objects as go
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession
 import gspread
 
 # ===== 日本時間 =====
@@ -19,8 +20,14 @@ def get_japan_time():
     """日本時間を取得"""
     return datetime.now(JST)
 
+# ===== シートの見出し行 =====
+PEE_HEADER = ("date", "time", "datetime")
+POOP_HEADER = ("date", "time", "datetime")
+BP_HEADER = ("date", "time", "datetime", "systolic", "diastolic", "pulse", "memo")
+
 # ===== Google Sheets接続 =====
 
+@st.cache_resource(show_spinner=False)
 def get_google_connection():
     """Google Sheetsへの接続を取得"""
     scopes = [
@@ -31,68 +38,171 @@ def get_google_connection():
         st.secrets["gcp_service_account"],
         scopes=scopes
     )
-    client = gspread.authorize(credentials)
+    # 接続はキャッシュされるので、このセッションのTLS接続はプロセス内で使い回される
+    session = AuthorizedSession(credentials)
+    client = gspread.Client(auth=credentials, session=session)
     return client
 
+@st.cache_resource(show_spinner=False)
 def get_spreadsheet():
     """スプレッドシートを取得"""
     client = get_google_connection()
     spreadsheet_url = st.secrets["spreadsheet_url"]
     return client.open_by_url(spreadsheet_url)
 
+@st.cache_resource(show_spinner=False)
+def get_worksheet(title, header):
+    """ワークシートを取得（なければ見出し行付きで作成）"""
+    spreadsheet = get_spreadsheet()
+    try:
+        return spreadsheet.worksheet(title)
+    except gspread.exceptions.WorksheetNotFound:
+        worksheet = spreadsheet.add_worksheet(title=title, rows=1000, cols=len(header))
+        worksheet.append_row(list(header))
+        return worksheet
+
+def column_range(title, column_count):
+    """A列から指定列数ぶんの範囲を作る（例: 'トイレ記録'!A:C）"""
+    last_column = gspread.utils.rowcol_to_a1(1, column_count).rstrip("1")
+    return gspread.utils.absolute_range_name(title, f"A:{last_column}")
+
+# シート名と見出し行
+SHEET_HEADERS = {
+    "トイレ記録": PEE_HEADER,
+    "うんこ記録": POOP_HEADER,
+    "血圧記録": BP_HEADER,
+}
+
+# 画面で使う列（先頭からこの列だけを読み込む）
+READ_COLUMNS = {
+    "トイレ記録": PEE_HEADER[:2],   # date, time
+    "うんこ記録": POOP_HEADER[:2],  # date, time
+    "血圧記録": BP_HEADER[:6],      # memo以外
+}
+
+# 数値として扱う列
+INT_COLUMNS = {
+    "血圧記録": ("systolic", "diastolic", "pulse"),
+}
+
+# 読み込んだデータを使い回す秒数
+SHEET_TTL = 60
+
+def build_frame(title, columns, rows):
+    """行データからDataFrameを作る"""
+    df = pd.DataFrame(rows, columns=columns)
+    # 日付は同じ文字列が何度も並ぶのでカテゴリ型で持つ
+    df["date"] = df["date"].astype("category")
+    for column in INT_COLUMNS.get(title, ()):
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+    return df
+
+def fetch_all_sheets():
+    """全シートを1回のbatchGetでまとめて読み込む"""
+    for title, header in SHEET_HEADERS.items():
+        get_worksheet(title, header)  # シートがなければ作成（2回目以降はキャッシュ）
+    
+    response = get_spreadsheet().values_batch_get(
+        [column_range(title, len(columns)) for title, columns in READ_COLUMNS.items()]
+    )
+    
+    sheets = {}
+    for (title, read_columns), value_range in zip(READ_COLUMNS.items(), response["valueRanges"]):
+        values = value_range.get("values", [])
+        columns = values[0] if values else list(read_columns)
+        # 末尾の空セルは返ってこないので列数を揃える
+        rows = gspread.utils.fill_gaps(values[1:], cols=len(columns)) if len(values) > 1 else []
+        sheets[title] = build_frame(title, columns, rows)
+    return sheets
+
+def load_all_sheets():
+    """全シートのデータを取得（セッション内でSHEET_TTL秒使い回す）"""
+    cached = st.session_state.get("sheets")
+    if cached is None or time.monotonic() - cached["loaded_at"] > SHEET_TTL:
+        cached = {"loaded_at": time.monotonic(), "data": fetch_all_sheets()}
+        st.session_state["sheets"] = cached
+    return cached["data"]
+
+def add_local_record(title, record):
+    """保存した記録を手元のデータにも追加（シートを読み直さない）"""
+    cached = st.session_state.get("sheets")
+    if cached is None:
+        return
+    try:
+        df = cached["data"][title]
+        new_row = build_frame(title, df.columns, [[record[column] for column in df.columns]])
+        df = pd.concat([df, new_row], ignore_index=True) if not df.empty else new_row
+        df["date"] = df["date"].astype("category")
+        cached["data"][title] = df
+    except Exception:
+        # 手元のデータに足せなければ、次の実行でシートから読み直す
+        clear_local_sheets()
+
+def clear_local_sheets():
+    """手元のデータを破棄（次の実行で読み直す）"""
+    st.session_state.pop("sheets", None)
+
+def delete_matching_row(title, header, row_index, record):
+    """表示していた記録と同じ行のときだけ削除する（違えばFalse）"""
+    worksheet = get_worksheet(title, header)
+    row = worksheet.row_values(row_index + 2)
+    if row[:2] != [record["date"], record["time"]]:
+        return False
+    worksheet.delete_rows(row_index + 2)
+    return True
+
+def append_record(title, header, row):
+    """シートの末尾に1行追加（values.appendを直接呼ぶ）"""
+    get_worksheet(title, header)  # シートがなければ作成（2回目以降はキャッシュ）
+    get_spreadsheet().values_append(
+        column_range(title, len(header)),
+        {"valueInputOption": "RAW"},
+        {"values": [row]}
+    )
+
 # ===== 時間フォーマット関数 =====
 
 def format_time_simple(time_str):
     """時間を「16時10分」形式に変換"""
     try:
-        time_obj = datetime.strptime(time_str, "%H:%M:%S")
-        hour = time_obj.hour
-        minute = time_obj.minute
-        return f"{hour}時{minute:02d}分"
-    except:
+        hour, minute, _ = time_str.split(":")
+        return f"{int(hour)}時{int(minute):02d}分"
+    except (AttributeError, ValueError):
         return time_str
 
+def format_number(value):
+    """数値を表示用に変換（空欄・数値でないセルは「-」）"""
+    return "-" if pd.isna(value) else f"{value}"
+
 # ===== おしっこデータ管理関数（シート名: トイレ記録） =====
 
 def load_pee_data():
     """おしっこ記録を読み込む"""
     try:
-        spreadsheet = get_spreadsheet()
-        worksheet = spreadsheet.worksheet("トイレ記録")
-        records = worksheet.get_all_records()
-        return records
-    except gspread.exceptions.WorksheetNotFound:
-        spreadsheet = get_spreadsheet()
-        worksheet = spreadsheet.add_worksheet(title="トイレ記録", rows=1000, cols=3)
-        worksheet.append_row(["date", "time", "datetime"])
-        return []
+        return load_all_sheets()["トイレ記録"]
     except Exception as e:
         st.error(f"データ読み込みエラー: {e}")
-        return []
+        return pd.DataFrame(columns=list(PEE_HEADER))
 
 def save_pee_record(record):
     """おしっこ記録を1件追加"""
     try:
-        spreadsheet = get_spreadsheet()
-        try:
-            worksheet = spreadsheet.worksheet("トイレ記録")
-        except gspread.exceptions.WorksheetNotFound:
-            worksheet = spreadsheet.add_worksheet(title="トイレ記録", rows=1000, cols=3)
-            worksheet.append_row(["date", "time", "datetime"])
-        
-        worksheet.append_row([record["date"], record["time"], record["datetime"]])
-        return True
+        append_record("トイレ記録", PEE_HEADER, [record[key] for key in PEE_HEADER])
     except Exception as e:
         st.error(f"保存エラー: {e}")
         return False
+    # シートへの保存は済んでいるので、ここで失敗しても保存成功として扱う
+    add_local_record("トイレ記録", record)
+    return True
 
-def delete_pee_record(row_index):
+def delete_pee_record(row_index, record):
     """おしっこ記録を削除"""
     try:
-        spreadsheet = get_spreadsheet()
-        worksheet = spreadsheet.worksheet("トイレ記録")
-        worksheet.delete_rows(row_index + 2)
-        return True
+        deleted = delete_matching_row("トイレ記録", PEE_HEADER, row_index, record)
+        clear_local_sheets()
+        if not deleted:
+            st.error("記録が更新されていたため削除しませんでした。もう一度確認してください")
+        return deleted
     except Exception as e:
         st.error(f"削除エラー: {e}")
         return False
@@ -102,42 +212,30 @@ def delete_pee_record(row_index):
 def load_poop_data():
     """うんこ記録を読み込む"""
     try:
-        spreadsheet = get_spreadsheet()
-        worksheet = spreadsheet.worksheet("うんこ記録")
-        records = worksheet.get_all_records()
-        return records
-    except gspread.exceptions.WorksheetNotFound:
-        spreadsheet = get_spreadsheet()
-        worksheet = spreadsheet.add_worksheet(title="うんこ記録", rows=1000, cols=3)
-        worksheet.append_row(["date", "time", "datetime"])
-        return []
+        return load_all_sheets()["うんこ記録"]
     except Exception as e:
         st.error(f"データ読み込みエラー: {e}")
-        return []
+        return pd.DataFrame(columns=list(POOP_HEADER))
 
 def save_poop_record(record):
     """うんこ記録を1件追加"""
     try:
-        spreadsheet = get_spreadsheet()
-        try:
-            worksheet = spreadsheet.worksheet("うんこ記録")
-        except gspread.exceptions.WorksheetNotFound:
-            worksheet = spreadsheet.add_worksheet(title="うんこ記録", rows=1000, cols=3)
-            worksheet.append_row(["date", "time", "datetime"])
-        
-        worksheet.append_row([record["date"], record["time"], record["datetime"]])
-        return True
+        append_record("うんこ記録", POOP_HEADER, [record[key] for key in POOP_HEADER])
     except Exception as e:
         st.error(f"保存エラー: {e}")
         return False
+    # シートへの保存は済んでいるので、ここで失敗しても保存成功として扱う
+    add_local_record("うんこ記録", record)
+    return True
 
-def delete_poop_record(row_index):
+def delete_poop_record(row_index, record):
     """うんこ記録を削除"""
     try:
-        spreadsheet = get_spreadsheet()
-        worksheet = spreadsheet.worksheet("うんこ記録")
-        worksheet.delete_rows(row_index + 2)
-        return True
+        deleted = delete_matching_row("うんこ記録", POOP_HEADER, row_index, record)
+        clear_local_sheets()
+        if not deleted:
+            st.error("記録が更新されていたため削除しませんでした。もう一度確認してください")
+        return deleted
     except Exception as e:
         st.error(f"削除エラー: {e}")
         return False
@@ -147,82 +245,101 @@ def delete_poop_record(row_index):
 def load_bp_data():
     """血圧記録を読み込む"""
     try:
-        spreadsheet = get_spreadsheet()
-        worksheet = spreadsheet.worksheet("血圧記録")
-        records = worksheet.get_all_records()
-        return records
-    except gspread.exceptions.WorksheetNotFound:
-        spreadsheet = get_spreadsheet()
-        worksheet = spreadsheet.add_worksheet(title="血圧記録", rows=1000, cols=7)
-        worksheet.append_row(["date", "time", "datetime", "systolic", "diastolic", "pulse", "memo"])
-        return []
+        return load_all_sheets()["血圧記録"]
     except Exception as e:
         st.error(f"データ読み込みエラー: {e}")
-        return []
+        return pd.DataFrame(columns=list(BP_HEADER))
 
 def save_bp_record(record):
     """血圧記録を1件追加"""
     try:
-        spreadsheet = get_spreadsheet()
-        try:
-            worksheet = spreadsheet.worksheet("血圧記録")
-        except gspread.exceptions.WorksheetNotFound:
-            worksheet = spreadsheet.add_worksheet(title="血圧記録", rows=1000, cols=7)
-            worksheet.append_row(["date", "time", "datetime", "systolic", "diastolic", "pulse", "memo"])
-        
-        worksheet.append_row([
-            record["date"], 
-            record["time"], 
-            record["datetime"],
-            record["systolic"],
-            record["diastolic"],
-            record["pulse"],
-            record["memo"]
-        ])
-        return True
+        append_record("血圧記録", BP_HEADER, [record[key] for key in BP_HEADER])
     except Exception as e:
         st.error(f"保存エラー: {e}")
         return False
+    # シートへの保存は済んでいるので、ここで失敗しても保存成功として扱う
+    add_local_record("血圧記録", record)
+    return True
 
-def delete_bp_record(row_index):
+def delete_bp_record(row_index, record):
     """血圧記録を削除"""
     try:
-        spreadsheet = get_spreadsheet()
-        worksheet = spreadsheet.worksheet("血圧記録")
-        worksheet.delete_rows(row_index + 2)
-        return True
+        deleted = delete_matching_row("血圧記録", BP_HEADER, row_index, record)
+        clear_local_sheets()
+        if not deleted:
+            st.error("記録が更新されていたため削除しませんでした。もう一度確認してください")
+        return deleted
     except Exception as e:
         st.error(f"削除エラー: {e}")
         return False
 
 # ===== 集計関数 =====
 
-def get_today_count(data):
+def get_daily_counts(data):
+    """日付ごとの回数を集計"""
+    return data["date"].value_counts()
+
+def get_today_count(counts, today_str):
     """今日の回数を取得"""
-    today = get_japan_time().strftime("%Y-%m-%d")
-    return len([r for r in data if r.get("date") == today])
+    return int(counts.get(today_str, 0))
 
-def get_weekly_data(data):
+def get_weekly_data(counts, today_date):
     """今週（日曜〜土曜）のデータを集計"""
-    today = get_japan_time().date()
-    
     # 今週の日曜日を計算
-    days_since_sunday = (today.weekday() + 1) % 7
-    sunday = today - timedelta(days=days_since_sunday)
-    
-    # 日曜〜土曜の7日間を生成
-    weekly_data = {}
-    for i in range(7):
-        date = (sunday + timedelta(days=i)).strftime("%Y-%m-%d")
-        weekly_data[date] = 0
-    
-    # 記録をカウント
-    for record in data:
-        date = record.get("date", "")
-        if date in weekly_data:
-            weekly_data[date] += 1
+    days_since_sunday = (today_date.weekday() + 1) % 7
+    sunday = today_date - timedelta(days=days_since_sunday)
     
-    return weekly_data
+    # 日曜〜土曜の7日間に揃える
+    dates = [(sunday + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+    return counts.reindex(dates, fill_value=0)
+
+# ===== グラフ作成関数 =====
+
+def build_weekly_chart(df_weekly, color_scale):
+    """週間の棒グラフを作成"""
+    fig = go.Figure(go.Bar(
+        x=df_weekly["表示日付"],
+        y=df_weekly["回数"],
+        marker=dict(color=df_weekly["回数"], colorscale=color_scale),
+        texttemplate='%{y}',
+        textposition='outside'
+    ))
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="回数",
+        showlegend=False,
+        margin=dict(l=20, r=20, t=20, b=20),
+        height=250
+    )
+    return fig
+
+def build_bp_chart(df_recent):
+    """血圧の推移グラフを作成"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=df_recent["表示日時"],
+        y=df_recent["systolic"],
+        mode='lines+markers',
+        name='上',
+        line=dict(color='#ff6b6b', width=2),
+        marker=dict(size=8)
+    ))
+    fig.add_trace(go.Scatter(
+        x=df_recent["表示日時"],
+        y=df_recent["diastolic"],
+        mode='lines+markers',
+        name='下',
+        line=dict(color='#4dabf7', width=2),
+        marker=dict(size=8)
+    ))
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="mmHg",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02),
+        margin=dict(l=20, r=20, t=40, b=20),
+        height=250
+    )
+    return fig
 
 # ===== ページ設定 =====
 st.set_page_config(
@@ -233,7 +350,7 @@ st.set_page_config(
 )
 
 # ===== スマホ向けCSS =====
-st.markdown("""
+MOBILE_CSS = """
 <style>
     /* 上部に余白を追加（Forkバー対策） */
     .block-container {
@@ -251,9 +368,13 @@ st.markdown("""
         font-size: 36px;
     }
     
-    .stTabs [data-baseweb="tab"] {
+    /* 画面切り替え */
+    .stRadio [role="radiogroup"] label {
+        padding: 10px 20px 10px 0;
+    }
+    
+    .stRadio [role="radiogroup"] label p {
         font-size: 16px;
-        padding: 10px 20px;
     }
     
     /* 記録リストの時間を大きく表示 */
@@ -270,23 +391,36 @@ st.markdown("""
         margin-right: 10px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(MOBILE_CSS, unsafe_allow_html=True)
 
 # ===== メイン画面 =====
 st.title("健康管理")
 
-# タブで機能を分ける
-tab1, tab2, tab3, tab4 = st.tabs(["おしっこ", "うんこ", "血圧", "削除"])
+# 現在時刻は1回の実行につき1度だけ取得する
+now = get_japan_time()
+today_str = now.strftime("%Y-%m-%d")
+today_date = now.date()
 
-# ===== タブ1: おしっこ記録 =====
-with tab1:
+# 画面を切り替える（選ばれた画面だけを実行する）
+page = st.radio(
+    "画面",
+    ["おしっこ", "うんこ", "血圧", "削除"],
+    horizontal=True,
+    label_visibility="collapsed",
+    key="page"
+)
+
+# ===== 画面1: おしっこ記録 =====
+if page == "おしっこ":
     pee_data = load_pee_data()
+    daily_counts = get_daily_counts(pee_data)
     
     # 記録ボタン
     if st.button("おしっこした", use_container_width=True, type="primary", key="pee_btn"):
-        now = get_japan_time()
         new_record = {
-            "date": now.strftime("%Y-%m-%d"),
+            "date": today_str,
             "time": now.strftime("%H:%M:%S"),
             "datetime": now.strftime("%Y-%m-%d %H:%M:%S")
         }
@@ -297,24 +431,21 @@ with tab1:
     st.markdown("---")
     
     # 今日の回数
-    today_count = get_today_count(pee_data)
+    today_count = get_today_count(daily_counts, today_str)
     st.metric(label="今日の回数", value=f"{today_count} 回")
     
     # 今日の記録一覧
     st.subheader("今日の記録")
-    today = get_japan_time().strftime("%Y-%m-%d")
-    today_records = [r for r in pee_data if r.get("date") == today]
-    
-    if today_records:
-        for i, record in enumerate(today_records, 1):
-            time_str = record.get('time', '')
-            formatted_time = format_time_simple(time_str)
-            st.markdown(
-                f'<div class="time-display">'
-                f'<span class="time-number">{i}.</span>{formatted_time}'
-                f'</div>', 
-                unsafe_allow_html=True
-            )
+    today_times = pee_data.loc[pee_data["date"] == today_str, "time"].tolist()
+    
+    if today_times:
+        records_html = "".join(
+            f'<div class="time-display">'
+            f'<span class="time-number">{i}.</span>{format_time_simple(time_str)}'
+            f'</div>'
+            for i, time_str in enumerate(today_times, 1)
+        )
+        st.markdown(records_html, unsafe_allow_html=True)
     else:
         st.info("まだ記録がありません")
     
@@ -323,58 +454,44 @@ with tab1:
     # 今週のグラフ（日曜〜土曜）
     st.subheader("今週の記録（日〜土）")
     
-    weekly_data = get_weekly_data(pee_data)
+    weekly_data = get_weekly_data(daily_counts, today_date)
     
     # 曜日ラベルを作成
     weekday_labels = ["日", "月", "火", "水", "木", "金", "土"]
-    dates = list(weekly_data.keys())
-    display_labels = []
-    for i, date in enumerate(dates):
-        day = pd.to_datetime(date).strftime("%m/%d")
-        display_labels.append(f"{day}({weekday_labels[i]})")
+    dates = weekly_data.index.tolist()
+    # 日付は「YYYY-MM-DD」の文字列なので切り出すだけでよい
+    display_labels = [
+        f"{date[5:7]}/{date[8:10]}({weekday})"
+        for date, weekday in zip(dates, weekday_labels)
+    ]
     
     df_weekly = pd.DataFrame({
         "日付": dates,
-        "回数": list(weekly_data.values()),
+        "回数": weekly_data.tolist(),
         "表示日付": display_labels
     })
     
-    fig = px.bar(
-        df_weekly,
-        x="表示日付",
-        y="回数",
-        color="回数",
-        color_continuous_scale="Blues"
-    )
-    fig.update_layout(
-        xaxis_title="",
-        yaxis_title="回数",
-        showlegend=False,
-        coloraxis_showscale=False,
-        margin=dict(l=20, r=20, t=20, b=20),
-        height=250
-    )
-    fig.update_traces(texttemplate='%{y}', textposition='outside')
-    
+    fig = build_weekly_chart(df_weekly, "Blues")
     st.plotly_chart(fig, use_container_width=True)
     
     # 統計情報
+    total = int(df_weekly["回数"].sum())
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("週間合計", f"{sum(weekly_data.values())} 回")
+        st.metric("週間合計", f"{total} 回")
     with col2:
-        avg = sum(weekly_data.values()) / 7
+        avg = total / 7
         st.metric("1日平均", f"{avg:.1f} 回")
 
-# ===== タブ2: うんこ記録 =====
-with tab2:
+# ===== 画面2: うんこ記録 =====
+elif page == "うんこ":
     poop_data = load_poop_data()
+    daily_counts = get_daily_counts(poop_data)
     
     # 記録ボタン
     if st.button("うんこした", use_container_width=True, type="primary", key="poop_btn"):
-        now = get_japan_time()
         new_record = {
-            "date": now.strftime("%Y-%m-%d"),
+            "date": today_str,
             "time": now.strftime("%H:%M:%S"),
             "datetime": now.strftime("%Y-%m-%d %H:%M:%S")
         }
@@ -385,24 +502,21 @@ with tab2:
     st.markdown("---")
     
     # 今日の回数
-    today_count = get_today_count(poop_data)
+    today_count = get_today_count(daily_counts, today_str)
     st.metric(label="今日の回数", value=f"{today_count} 回")
     
     # 今日の記録一覧
     st.subheader("今日の記録")
-    today = get_japan_time().strftime("%Y-%m-%d")
-    today_records = [r for r in poop_data if r.get("date") == today]
-    
-    if today_records:
-        for i, record in enumerate(today_records, 1):
-            time_str = record.get('time', '')
-            formatted_time = format_time_simple(time_str)
-            st.markdown(
-                f'<div class="time-display">'
-                f'<span class="time-number">{i}.</span>{formatted_time}'
-                f'</div>', 
-                unsafe_allow_html=True
-            )
+    today_times = poop_data.loc[poop_data["date"] == today_str, "time"].tolist()
+    
+    if today_times:
+        records_html = "".join(
+            f'<div class="time-display">'
+            f'<span class="time-number">{i}.</span>{format_time_simple(time_str)}'
+            f'</div>'
+            for i, time_str in enumerate(today_times, 1)
+        )
+        st.markdown(records_html, unsafe_allow_html=True)
     else:
         st.info("まだ記録がありません")
     
@@ -411,52 +525,38 @@ with tab2:
     # 今週のグラフ（日曜〜土曜）
     st.subheader("今週の記録（日〜土）")
     
-    weekly_data = get_weekly_data(poop_data)
+    weekly_data = get_weekly_data(daily_counts, today_date)
     
     # 曜日ラベルを作成
     weekday_labels = ["日", "月", "火", "水", "木", "金", "土"]
-    dates = list(weekly_data.keys())
-    display_labels = []
-    for i, date in enumerate(dates):
-        day = pd.to_datetime(date).strftime("%m/%d")
-        display_labels.append(f"{day}({weekday_labels[i]})")
+    dates = weekly_data.index.tolist()
+    # 日付は「YYYY-MM-DD」の文字列なので切り出すだけでよい
+    display_labels = [
+        f"{date[5:7]}/{date[8:10]}({weekday})"
+        for date, weekday in zip(dates, weekday_labels)
+    ]
     
     df_weekly = pd.DataFrame({
         "日付": dates,
-        "回数": list(weekly_data.values()),
+        "回数": weekly_data.tolist(),
         "表示日付": display_labels
     })
     
-    fig = px.bar(
-        df_weekly,
-        x="表示日付",
-        y="回数",
-        color="回数",
-        color_continuous_scale="Oranges"  # うんこは茶色系
-    )
-    fig.update_layout(
-        xaxis_title="",
-        yaxis_title="回数",
-        showlegend=False,
-        coloraxis_showscale=False,
-        margin=dict(l=20, r=20, t=20, b=20),
-        height=250
-    )
-    fig.update_traces(texttemplate='%{y}', textposition='outside')
-    
+    fig = build_weekly_chart(df_weekly, "Oranges")  # うんこは茶色系
     st.plotly_chart(fig, use_container_width=True)
     
     # 統計情報
+    total = int(df_weekly["回数"].sum())
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("週間合計", f"{sum(weekly_data.values())} 回")
+        st.metric("週間合計", f"{total} 回")
     with col2:
-        avg = sum(weekly_data.values()) / 7
+        avg = total / 7
         st.metric("1日平均", f"{avg:.1f} 回")
 
-# ===== タブ3: 血圧記録 =====
-with tab3:
-    bp_data = load_bp_data()
+# ===== 画面3: 血圧記録 =====
+elif page == "血圧":
+    df_bp = load_bp_data()
     
     st.subheader("血圧を記録")
     
@@ -484,9 +584,8 @@ with tab3:
         submitted = st.form_submit_button("記録する", use_container_width=True)
         
         if submitted:
-            now = get_japan_time()
             new_record = {
-                "date": now.strftime("%Y-%m-%d"),
+                "date": today_str,
                 "time": now.strftime("%H:%M:%S"),
                 "datetime": now.strftime("%Y-%m-%d %H:%M:%S"),
                 "systolic": systolic,
@@ -500,77 +599,55 @@ with tab3:
     
     st.markdown("---")
     
-    if bp_data:
+    if not df_bp.empty:
         # 最新の記録
         st.subheader("最新の記録")
-        latest = bp_data[-1]
+        latest = df_bp.iloc[-1]
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("上", f"{latest.get('systolic', '-')}")
+            st.metric("上", format_number(latest.get('systolic')))
         with col2:
-            st.metric("下", f"{latest.get('diastolic', '-')}")
+            st.metric("下", format_number(latest.get('diastolic')))
         with col3:
-            st.metric("脈拍", f"{latest.get('pulse', '-')}")
+            st.metric("脈拍", format_number(latest.get('pulse')))
         
         st.markdown("---")
         
         # 推移グラフ
         st.subheader("推移グラフ")
         
-        df_bp = pd.DataFrame(bp_data)
-        df_recent = df_bp.tail(10).copy()
-        df_recent["表示日時"] = pd.to_datetime(df_recent["datetime"]).dt.strftime("%m/%d")
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df_recent["表示日時"],
-            y=df_recent["systolic"],
-            mode='lines+markers',
-            name='上',
-            line=dict(color='#ff6b6b', width=2),
-            marker=dict(size=8)
-        ))
-        fig.add_trace(go.Scatter(
-            x=df_recent["表示日時"],
-            y=df_recent["diastolic"],
-            mode='lines+markers',
-            name='下',
-            line=dict(color='#4dabf7', width=2),
-            marker=dict(size=8)
-        ))
-        fig.update_layout(
-            xaxis_title="",
-            yaxis_title="mmHg",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02),
-            margin=dict(l=20, r=20, t=40, b=20),
-            height=250
+        df_recent = df_bp.tail(10).assign(
+            表示日時=lambda d: pd.to_datetime(d["datetime"]).dt.strftime("%m/%d")
         )
         
+        fig = build_bp_chart(df_recent)
         st.plotly_chart(fig, use_container_width=True)
         
         # 記録一覧
         st.subheader("記録一覧")
-        df_display = df_bp[["datetime", "systolic", "diastolic", "pulse"]].copy()
+        df_display = df_bp.tail(10).iloc[::-1][["datetime", "systolic", "diastolic", "pulse"]]
         df_display.columns = ["日時", "上", "下", "脈拍"]
-        st.dataframe(df_display.iloc[::-1].head(10), use_container_width=True, hide_index=True)
+        st.dataframe(df_display, use_container_width=True, hide_index=True)
     else:
         st.info("まだ血圧の記録がありません")
 
-# ===== タブ4: 削除 =====
-with tab4:
+# ===== 画面4: 削除 =====
+elif page == "削除":
     st.subheader("記録を削除")
     st.warning("削除すると元に戻せません")
     
+    # 行番号で削除するため、この画面では毎回シートから読み直す
+    clear_local_sheets()
+    
     delete_type = st.radio("削除する記録", ["おしっこ", "うんこ", "血圧"], horizontal=True)
     
     if delete_type == "おしっこ":
         pee_data = load_pee_data()
         
-        if pee_data:
+        if not pee_data.empty:
             st.markdown("**最新の記録から削除できます**")
             
-            recent_records = pee_data[-5:] if len(pee_data) >= 5 else pee_data
-            recent_records = list(reversed(recent_records))
+            recent_records = pee_data.tail(5).to_dict("records")[::-1]
             
             for i, record in enumerate(recent_records):
                 original_index = len(pee_data) - 1 - i
@@ -581,8 +658,9 @@ with tab4:
                     formatted_time = format_time_simple(time_str)
                     st.write(f"{date_str}  {formatted_time}")
                 with col2:
-                    if st.button("削除", key=f"del_pee_{original_index}", type="secondary"):
-                        if delete_pee_record(original_index):
+                    record_key = f"{original_index}_{record.get('date', '')}_{record.get('time', '')}"
+                    if st.button("削除", key=f"del_pee_{record_key}", type="secondary"):
+                        if delete_pee_record(original_index, record):
                             st.success("削除しました")
                             st.rerun()
         else:
@@ -591,11 +669,10 @@ with tab4:
     elif delete_type == "うんこ":
         poop_data = load_poop_data()
         
-        if poop_data:
+        if not poop_data.empty:
             st.markdown("**最新の記録から削除できます**")
             
-            recent_records = poop_data[-5:] if len(poop_data) >= 5 else poop_data
-            recent_records = list(reversed(recent_records))
+            recent_records = poop_data.tail(5).to_dict("records")[::-1]
             
             for i, record in enumerate(recent_records):
                 original_index = len(poop_data) - 1 - i
@@ -606,8 +683,9 @@ with tab4:
                     formatted_time = format_time_simple(time_str)
                     st.write(f"{date_str}  {formatted_time}")
                 with col2:
-                    if st.button("削除", key=f"del_poop_{original_index}", type="secondary"):
-                        if delete_poop_record(original_index):
+                    record_key = f"{original_index}_{record.get('date', '')}_{record.get('time', '')}"
+                    if st.button("削除", key=f"del_poop_{record_key}", type="secondary"):
+                        if delete_poop_record(original_index, record):
                             st.success("削除しました")
                             st.rerun()
         else:
@@ -616,23 +694,23 @@ with tab4:
     else:  # 血圧
         bp_data = load_bp_data()
         
-        if bp_data:
+        if not bp_data.empty:
             st.markdown("**最新の記録から削除できます**")
             
-            recent_records = bp_data[-5:] if len(bp_data) >= 5 else bp_data
-            recent_records = list(reversed(recent_records))
+            recent_records = bp_data.tail(5).to_dict("records")[::-1]
             
             for i, record in enumerate(recent_records):
                 original_index = len(bp_data) - 1 - i
                 col1, col2 = st.columns([3, 1])
                 with col1:
                     date_str = record.get('date', '')
-                    systolic = record.get('systolic', '-')
-                    diastolic = record.get('diastolic', '-')
+                    systolic = format_number(record.get('systolic'))
+                    diastolic = format_number(record.get('diastolic'))
                     st.write(f"{date_str}  {systolic}/{diastolic}")
                 with col2:
-                    if st.button("削除", key=f"del_bp_{original_index}", type="secondary"):
-                        if delete_bp_record(original_index):
+                    record_key = f"{original_index}_{record.get('date', '')}_{record.get('time', '')}"
+                    if st.button("削除", key=f"del_bp_{record_key}", type="secondary"):
+                        if delete_bp_record(original_index, record):
                             st.success("削除しました")
                             st.rerun()
         else: